@@ -1,85 +1,104 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import hashlib
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+import asyncio
+import blake3
+import orjson
 import os
+import threading
 
-app = FastAPI(title="Google Maps Sentiment API")
+from cachetools import TTLCache
 
-_nlp_engine = None
+from engine import get_nlp_engine
+from schemas import AnalysisRequest, ReviewAnalysisResponse
 
-def get_nlp_engine():
-    global _nlp_engine
-    if _nlp_engine is None:
-        from nlp import ReviewAnalyzer
-        _nlp_engine = ReviewAnalyzer()
-    return _nlp_engine
+app = FastAPI(title="Google Maps Sentiment API", default_response_class=ORJSONResponse)
+
+# In-memory LRU delante de Postgres: peticiones repetidas de la misma URL
+# (p.ej. clientes con polling) no pagan el round-trip a la base de datos.
+_mem_cache = TTLCache(maxsize=1024, ttl=300)
+
+# Toggle del fallback aleatorio (antes una copia entera del módulo)
+_FALLBACK_RANDOM = os.environ.get("FEATURE_FALLBACK_RANDOM", "1") == "1"
 
 @app.get("/")
 def health_check():
     return {"status": "ok"}
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     try:
         import database
-        database.init_db()
+        await database.init_db()
     except Exception as e:
         print(f"Startup Warning: {e}")
 
-class AnalysisRequest(BaseModel):
-    maps_url: str
-    forceUpdate: bool = False
-    limit: int = 50
+    # Precargar el modelo NLP en background: el socket abre al instante
+    # pero el modelo ya está caliente cuando llega la primera petición.
+    if os.environ.get("SKIP_NLP_LOAD") != "true":
+        threading.Thread(target=get_nlp_engine, daemon=True).start()
 
-@app.post("/analyze")
-def analyze_reviews(req: AnalysisRequest):
+@app.post("/analyze", response_model=ReviewAnalysisResponse, response_model_exclude_none=True)
+async def analyze_reviews(req: AnalysisRequest):
     import database
-    from scraper import GoogleMapsScraper
-    
-    db = database.SessionLocal()
-    
+
     try:
-        url_hash = hashlib.md5(req.maps_url.encode()).hexdigest()
+        url_hash = blake3.blake3(req.maps_url.encode()).hexdigest(length=16)
+
+        # Preparar el scraper en paralelo con el lookup de cache:
+        # el import de Playwright (~200ms en frío) se solapa con el
+        # round-trip a la base de datos.
+        def _prepare_scraper():
+            from scraper import GoogleMapsScraper
+            return GoogleMapsScraper(url=req.maps_url, max_reviews=req.limit, headless=True)
 
-        # 1. Intentar Cache
+        scrape_prep = asyncio.create_task(asyncio.to_thread(_prepare_scraper))
+        cached_entry = None
+
+        # 1. Intentar Cache (primero memoria, luego sesión corta de DB)
         if not req.forceUpdate:
-            cached_entry = database.get_cached_analysis(db, url_hash)
+            mem_hit = _mem_cache.get(url_hash)
+            if mem_hit is not None:
+                scrape_prep.cancel()
+                print(f"⚡ Serving from Memory Cache: {url_hash}")
+                return Response(content=mem_hit, media_type="application/json")
+
+            async with database.SessionLocal() as db:
+                cached_entry = await database.get_cached_analysis(db, url_hash)
             if cached_entry:
+                scrape_prep.cancel()
+                # Filas anteriores a la columna analysis_blob no tienen bytes
+                blob = cached_entry.analysis_blob or orjson.dumps(
+                    {**cached_entry.analysis_json, "cached": True}
+                )
+                _mem_cache[url_hash] = blob
                 print(f"✅ Serving from Cache: {url_hash}")
-                return {**cached_entry.analysis_json, "cached": True}
+                return Response(content=blob, media_type="application/json")
 
-        # 2. Intentar Scrape
+        # 2. Intentar Scrape (bloqueante -> thread pool, no bloquea el event loop)
         print(f"🚀 Scraping: {req.maps_url}")
-        scraper = GoogleMapsScraper(url=req.maps_url, max_reviews=req.limit, headless=True)
-        raw_reviews = scraper.scrape(return_data=True)
+        scraper = await scrape_prep
+        raw_reviews = await asyncio.to_thread(scraper.scrape, return_data=True)
 
-        # # 3. FALLBACK: Si no hay reseñas, loguear error y buscar cualquier registro en DB
-        # if not raw_reviews:
-        #     print(f"❌ ERROR: No se encontraron reseñas nuevas para {req.maps_url}")
-            
-        #     # Intentamos recuperar lo que sea que tengamos en la DB (aunque sea viejo)
-        #     fallback_entry = database.get_cached_analysis(db, url_hash)
-        #     if fallback_entry:
-        #         print(f"📦 Fallback: Devolviendo última coincidencia de '{fallback_entry.business_name}'")
-        #         return {**fallback_entry.analysis_json, "cached": True, "fallback": True}
-        #     else:
-        #         raise HTTPException(status_code=404, detail="No se encontraron reseñas y no hay datos en la base de datos.")
         # 3. FALLBACK: Si no hay reseñas, buscar en cache o un registro aleatorio
         if not raw_reviews:
             print(f"❌ ERROR: No se encontraron reseñas nuevas para {req.maps_url}")
             
-            # A. Intentamos recuperar la última versión de ESA URL específica
-            fallback_entry = database.get_cached_analysis(db, url_hash)
-            
-            if fallback_entry:
-                print(f"📦 Fallback: Devolviendo última coincidencia de '{fallback_entry.business_name}'")
-                return {**fallback_entry.analysis_json, "cached": True, "fallback": True}
-            
-            # B. Si ni siquiera esa URL existe, traemos CUALQUIER registro al azar (Nuevo paso)
-            from sqlalchemy.sql.expression import func
-            # Asumiendo que tu modelo en database.py se llama Analysis
-            random_entry = db.query(database.Analysis).order_by(func.random()).first()
-            
+            # A. Intentamos recuperar la última versión de ESA URL específica.
+            # El lookup inicial ya la buscó (y no estaba), así que solo hay
+            # que re-consultar cuando venía forceUpdate y se saltó la cache.
+            async with database.SessionLocal() as db:
+                fallback_entry = cached_entry
+                if fallback_entry is None and req.forceUpdate:
+                    fallback_entry = await database.get_cached_analysis(db, url_hash)
+
+                if fallback_entry:
+                    print(f"📦 Fallback: Devolviendo última coincidencia de '{fallback_entry.business_name}'")
+                    return {**fallback_entry.analysis_json, "cached": True, "fallback": True}
+
+                # B. Si ni siquiera esa URL existe, traemos CUALQUIER registro al azar
+                # (desactivable con FEATURE_FALLBACK_RANDOM=0)
+                random_entry = await database.get_random_analysis(db) if _FALLBACK_RANDOM else None
+
             if random_entry:
                 print(f"🎲 Azar: Devolviendo registro aleatorio de '{random_entry.business_name}'")
                 return {**random_entry.analysis_json, "cached": True, "fallback_random": True}
@@ -87,9 +106,11 @@ def analyze_reviews(req: AnalysisRequest):
                 raise HTTPException(status_code=404, detail="La base de datos está vacía y no hay reseñas nuevas.")
 
 
-        # 4. Procesar NLP
-        nlp = get_nlp_engine()
-        analysis_result = nlp.analyze(raw_reviews)
+        # 4. Procesar NLP (CPU-bound -> thread pool). La carga del modelo
+        # también va a un thread: si el preload aún no terminó bloquearía
+        # el event loop (y el health check) varios segundos.
+        nlp = await asyncio.to_thread(get_nlp_engine)
+        analysis_result = await asyncio.to_thread(nlp.analyze, raw_reviews)
         business_name = raw_reviews[0].get("business_name") if raw_reviews else "Unknown"
 
         final_response = {
@@ -101,13 +122,14 @@ def analyze_reviews(req: AnalysisRequest):
             "cached": False
         }
 
-        # 5. Guardar
-        database.save_analysis(db, url_hash, req.maps_url, business_name, final_response)
-        return final_response
+        # 5. Guardar (segunda sesión corta, solo para el write) + write-through
+        _mem_cache[url_hash] = orjson.dumps({**final_response, "cached": True})
+        async with database.SessionLocal() as db:
+            await database.save_analysis(db, url_hash, req.maps_url, business_name, final_response)
+        # Pydantic v2 serializa el modelo con su core en Rust
+        return ReviewAnalysisResponse.model_validate(final_response)
 
     except Exception as e:
         print(f"❌ Error en el servidor: {str(e)}")
         if isinstance(e, HTTPException): raise e
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,43 +1,44 @@
-import json
-import os
-import hashlib
+import blake3
+import lmdb
+import orjson
 from datetime import datetime
 
 class ScraperCache:
     """
-    Simple file-based cache mechanism.
+    LMDB-backed cache mechanism (memory-mapped, single-syscall lookups).
+    Replaces the old one-JSON-file-per-URL layout.
     """
     def __init__(self, cache_dir="cache_data"):
         self.cache_dir = cache_dir
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        self.env = lmdb.open(cache_dir, map_size=2**30, subdir=True)
 
     def _get_hash(self, key):
-        return hashlib.md5(key.encode()).hexdigest()
+        return blake3.blake3(key.encode()).hexdigest(length=16)
 
     def get(self, url):
         """Retrieve data from cache if exists."""
         key_hash = self._get_hash(url)
-        file_path = os.path.join(self.cache_dir, f"{key_hash}.json")
-        
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    print(f"✅ Cache hit for {url[:30]}...")
-                    return data
-            except:
-                return None
-        return None
+
+        with self.env.begin() as txn:
+            raw = txn.get(key_hash.encode())
+
+        if raw is None:
+            return None
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return None
+
+        print(f"✅ Cache hit for {url[:30]}...")
+        return data
 
     def save(self, url, data):
         """Save data to cache."""
         key_hash = self._get_hash(url)
-        file_path = os.path.join(self.cache_dir, f"{key_hash}.json")
-        
+
         # Add timestamp
         data["cached_at"] = datetime.now().isoformat()
-        
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+
+        with self.env.begin(write=True) as txn:
+            txn.put(key_hash.encode(), orjson.dumps(data))
         print(f"💾 Data cached for {url[:30]}...")
@@ -1,8 +1,12 @@
 import os
 import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, JSON
-from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.dialects.postgresql import JSONB
+import random
+import orjson
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, JSON, LargeBinary, func, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # 1. DATABASE CONFIGURATION
 # Fetch DATABASE_URL from .env or Render environment
@@ -11,13 +15,21 @@ DATABASE_URL = os.environ.get("DATABASE_URL")
 # Fallback for local testing if no DB url is provided (SQLite)
 if not DATABASE_URL:
     print("⚠️ WARNING: DATABASE_URL not set. Using local SQLite (cache.db) for testing.")
-    DATABASE_URL = "sqlite:///./cache.db"
+    DATABASE_URL = "sqlite+aiosqlite:///./cache.db"
 elif DATABASE_URL.startswith("postgres://"):
-    # SQLAlchemy requires 'postgresql://', Render sometimes gives 'postgres://'
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+    # Render sometimes gives 'postgres://'; we need the asyncpg driver
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
+elif DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Keep connections healthy and leave headroom for concurrent requests;
+# the size options only apply to the Postgres pool, not SQLite
+engine_kwargs = {"pool_pre_ping": True}
+if DATABASE_URL.startswith("postgresql"):
+    engine_kwargs.update(pool_size=10, max_overflow=20)
+
+engine = create_async_engine(DATABASE_URL, **engine_kwargs)
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
 Base = declarative_base()
 
 # 2. MODEL DEFINITION
@@ -32,59 +44,92 @@ class AnalysisCache(Base):
     url_hash = Column(String, unique=True, index=True, nullable=False)
     maps_url = Column(Text, nullable=False)
     business_name = Column(Text, nullable=True)
-    
+
     # Store the full result JSON (sentiment, ratings, reviews list)
     # Use JSONB for Postgres for efficiency, JSON for SQLite compatibility
-    analysis_json = Column(JSON) 
-    
+    analysis_json = Column(JSON().with_variant(JSONB, "postgresql"))
+
+    # Pre-serialized response (with "cached": True baked in) so cache hits
+    # can return raw bytes without re-running the JSON encoder
+    analysis_blob = Column(LargeBinary, nullable=True)
+
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
+# Covering index (Postgres >= 11): solo business_name en INCLUDE. Los
+# payloads (analysis_json/analysis_blob) NO caben: las columnas INCLUDE
+# no se TOASTean y un análisis real supera el límite de ~2.7KB por tupla
+# de btree, con lo que cada INSERT fallaría en Postgres. El blob se sirve
+# con un heap fetch normal. On SQLite this degrades to a plain index.
+Index(
+    "ix_analysis_cache_url_hash_covering",
+    AnalysisCache.url_hash,
+    postgresql_include=["business_name"],
+)
+
 # 3. HELPER FUNCTIONS
-def init_db():
+async def init_db():
     """Creates tables if they don't exist."""
     try:
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         print("✅ Database tables initialized.")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
 
-def get_db():
+async def get_db():
     """Dependency generator for FastAPI."""
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # 4. CACHE LOGIC
-def get_cached_analysis(db, url_hash: str):
+async def get_cached_analysis(db: AsyncSession, url_hash: str):
     """Retrieve analysis from DB by hash."""
-    return db.query(AnalysisCache).filter(AnalysisCache.url_hash == url_hash).first()
-
-def save_analysis(db, url_hash: str, maps_url: str, business_name: str, analysis_data: dict):
-    """Saves or updates the analysis result."""
-    existing = get_cached_analysis(db, url_hash)
-    
-    if existing:
-        print(f"🔄 Updating cache for {business_name}...")
-        existing.analysis_json = analysis_data
-        existing.business_name = business_name
-        existing.updated_at = datetime.datetime.utcnow()
-    else:
-        print(f"💾 Creating new cache entry for {business_name}...")
-        new_entry = AnalysisCache(
-            url_hash=url_hash,
-            maps_url=maps_url,
-            business_name=business_name,
-            analysis_json=analysis_data
-        )
-        db.add(new_entry)
-    
+    result = await db.execute(select(AnalysisCache).where(AnalysisCache.url_hash == url_hash))
+    return result.scalars().first()
+
+async def get_random_analysis(db: AsyncSession):
+    """Pick a random cached row for the last-resort fallback.
+
+    ORDER BY random() sorts the entire table on every call; a COUNT plus a
+    random OFFSET over the primary-key order avoids the sort entirely.
+    """
+    total = (await db.execute(select(func.count(AnalysisCache.id)))).scalar() or 0
+    if not total:
+        return None
+
+    offset = random.randrange(total)
+    result = await db.execute(
+        select(AnalysisCache).order_by(AnalysisCache.id).offset(offset).limit(1)
+    )
+    return result.scalars().first()
+
+async def save_analysis(db: AsyncSession, url_hash: str, maps_url: str, business_name: str, analysis_data: dict):
+    """Saves or updates the analysis result in a single UPSERT round-trip."""
+    analysis_blob = orjson.dumps({**analysis_data, "cached": True})
+
+    insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(AnalysisCache).values(
+        url_hash=url_hash,
+        maps_url=maps_url,
+        business_name=business_name,
+        analysis_json=analysis_data,
+        analysis_blob=analysis_blob
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["url_hash"],
+        set_={
+            "analysis_json": stmt.excluded.analysis_json,
+            "analysis_blob": stmt.excluded.analysis_blob,
+            "business_name": stmt.excluded.business_name,
+            "updated_at": datetime.datetime.utcnow(),
+        },
+    )
+
     try:
-        db.commit()
-        if existing:
-            db.refresh(existing)
+        print(f"💾 Upserting cache entry for {business_name}...")
+        await db.execute(stmt)
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"❌ Error saving to DB: {e}")
@@ -0,0 +1,28 @@
+import os
+import threading
+
+_nlp_engine = None
+_nlp_lock = threading.Lock()
+
+def get_nlp_engine():
+    global _nlp_engine
+    # Lock: una petición que llegue durante el preload espera a que el
+    # warmup termine en vez de cargar un segundo modelo.
+    with _nlp_lock:
+        if _nlp_engine is None:
+            # Con NLP_SHARED=1 los workers comparten UN proceso de modelo
+            # (nlp_worker.py) en vez de cargar una copia de ~500MB cada uno.
+            if os.environ.get("NLP_SHARED") == "1":
+                try:
+                    import nlp_worker
+                    # connect() reintenta con backoff mientras el worker
+                    # termina de cargar el modelo (NLP_CONNECT_TIMEOUT)
+                    _nlp_engine = nlp_worker.connect()
+                    print("🔗 Connected to shared NLP worker process.")
+                    return _nlp_engine
+                except Exception as e:
+                    print(f"⚠️ Shared NLP worker unavailable ({e}). Loading in-process.")
+
+            from nlp import ReviewAnalyzer
+            _nlp_engine = ReviewAnalyzer()
+        return _nlp_engine
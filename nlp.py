@@ -1,16 +1,145 @@
+import os
+import statistics
+import threading
+from collections import Counter
+
+# Must be exported before torch is imported for OMP to honor it
+os.environ.setdefault(
+    "OMP_NUM_THREADS",
+    os.environ.get("TORCH_NUM_THREADS", str(os.cpu_count() or 1)),
+)
+
+import blake3
+from cachetools import LRUCache
 from pysentimiento import create_analyzer
 import torch
 
+# ONNX Runtime backend configuration (disable with NLP_BACKEND=torch)
+ONNX_DIR = "./onnx/robertuito"
+ONNX_MODEL_NAME = "pysentimiento/robertuito-sentiment-analysis"
+
+
+class _OnnxPrediction:
+    """Minimal stand-in for pysentimiento's prediction result object."""
+    def __init__(self, output, probas):
+        self.output = output  # POS, NEG, NEU
+        self.probas = probas
+
+
+class OnnxAnalyzer:
+    """
+    Drop-in replacement for the pysentimiento analyzer backed by ONNX Runtime.
+    Exports (and int8-quantizes) robertuito once to ONNX_DIR, then serves
+    predictions through a HF TextClassificationPipeline on CPU.
+    """
+
+    def __init__(self):
+        from transformers import AutoTokenizer, pipeline
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+
+        self._ensure_exported()
+        model = ORTModelForSequenceClassification.from_pretrained(
+            ONNX_DIR,
+            file_name="model_quantized.onnx",
+            provider="CPUExecutionProvider",
+        )
+        tokenizer = AutoTokenizer.from_pretrained(ONNX_DIR)
+        self.pipeline = pipeline(
+            "sentiment-analysis", model=model, tokenizer=tokenizer, top_k=None
+        )
+
+    @staticmethod
+    def _ensure_exported():
+        """Exports the model to ONNX + int8 quantization (one-time, slow)."""
+        if os.path.exists(os.path.join(ONNX_DIR, "model_quantized.onnx")):
+            return
+
+        import subprocess
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print("📦 Exporting robertuito to ONNX (one-time operation)...")
+        subprocess.run(
+            [
+                "optimum-cli", "export", "onnx",
+                "--model", ONNX_MODEL_NAME,
+                "--task", "text-classification",
+                ONNX_DIR,
+            ],
+            check=True,
+        )
+        quantize_dynamic(
+            os.path.join(ONNX_DIR, "model.onnx"),
+            os.path.join(ONNX_DIR, "model_quantized.onnx"),
+            weight_type=QuantType.QInt8,
+        )
+        print("✅ ONNX export + int8 quantization done.")
+
+    def predict(self, texts, batch_size=32):
+        """Mirrors pysentimiento's predict: accepts a str or a list of str."""
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        outputs = self.pipeline(texts, batch_size=batch_size, truncation=True)
+
+        predictions = []
+        for scores in outputs:
+            probas = {s["label"]: s["score"] for s in scores}
+            output = max(probas, key=probas.get)
+            predictions.append(_OnnxPrediction(output, probas))
+
+        return predictions[0] if single else predictions
+
+
 class ReviewAnalyzer:
     """
     NLP Engine using Pysentimiento (Transformers) for Spanish Sentiment Analysis.
+    Prefers an ONNX Runtime (int8) backend on CPU; falls back to torch.
     """
     def __init__(self):
+        # Cache texto -> (sentiment, confidence): recurring reviews from
+        # repeated scrapes of the same business skip the transformer.
+        # LRUCache no es thread-safe y analyze() corre vía to_thread, así
+        # que todo acceso va bajo lock (mismo patrón que engine.py).
+        self._pred_cache = LRUCache(maxsize=50_000)
+        self._cache_lock = threading.Lock()
+
+        backend = os.environ.get("NLP_BACKEND", "onnx")
+
+        if backend == "onnx":
+            try:
+                print("🧠 Loading NLP Model (ONNX Runtime / robertuito)...")
+                self.analyzer = OnnxAnalyzer()
+                self.device = "cpu"
+                print("✅ ONNX model loaded (CPUExecutionProvider, int8).")
+                self._warmup()
+                return
+            except Exception as e:
+                print(f"⚠️ ONNX backend unavailable ({e}). Falling back to torch.")
+
         print("🧠 Loading NLP Model (pysentimiento/robertuito)...")
+        # Pin intra-op threads to the container quota and keep inter-op at 1
+        # so concurrent requests don't oversubscribe the CPU
+        torch.set_num_threads(int(os.environ.get("TORCH_NUM_THREADS", os.cpu_count() or 1)))
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass  # already configured (e.g. model reload in the same process)
         # Use GPU if available, else CPU
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.analyzer = create_analyzer(task="sentiment", lang="es")
+        # batch_size va en el constructor: predict() de pysentimiento no
+        # acepta ese kwarg (solo lo acepta OnnxAnalyzer.predict)
+        self.analyzer = create_analyzer(task="sentiment", lang="es", batch_size=32)
         print(f"✅ Model loaded on {self.device}")
+        self._warmup()
+
+    def _warmup(self):
+        """One dummy prediction to trigger torch/ORT lazy kernel init."""
+        try:
+            with torch.inference_mode():
+                self.analyzer.predict("warmup")
+        except Exception as e:
+            print(f"⚠️ Warmup prediction failed: {e}")
 
     def analyze(self, reviews):
         """
@@ -18,45 +147,79 @@ class ReviewAnalyzer:
         Adds 'sentiment' and 'confidence' keys to each review dict.
         """
         results = []
-        summary = {"POS": 0, "NEG": 0, "NEU": 0}
-        total_rating = 0
-        valid_ratings = 0
 
         print(f"🔍 Analyzing {len(reviews)} reviews...")
-        
+
+        # Partition upfront: reviews with real text go through the model in
+        # ONE batched call (pysentimiento forwards the list to a HF pipeline),
+        # trivial/empty texts are tagged neutral without touching the model.
+        to_predict = []
         for r in reviews:
             text = r.get("review_text", "")
-            
-            # Simple metadata calculation
-            if r.get("rating"):
-                total_rating += float(r["rating"])
-                valid_ratings += 1
 
-            # NLP Prediction
             if text and len(text) > 2:
-                try:
-                    prediction = self.analyzer.predict(text)
-                    sentiment = prediction.output # POS, NEG, NEU
-                    score = max(prediction.probas.values())
-                    
-                    r["sentiment"] = sentiment
-                    r["confidence"] = round(score, 4)
-                    
-                    if sentiment in summary:
-                        summary[sentiment] += 1
-                except Exception as e:
-                    print(f"⚠️ NLP Error on text: {text[:20]}... {e}")
-                    r["sentiment"] = "ERROR"
-                    r["confidence"] = 0.0
+                to_predict.append(r)
             else:
                 r["sentiment"] = "NEU" # Empty text usually neutral
                 r["confidence"] = 1.0
-                summary["NEU"] += 1
-            
+
             results.append(r)
 
-        avg_rating = round(total_rating / valid_ratings, 2) if valid_ratings > 0 else 0
-        
+        # Resolve already-seen texts from the prediction cache; only the
+        # misses go through the model.
+        misses = []
+        with self._cache_lock:
+            for r in to_predict:
+                key = blake3.blake3(r["review_text"].encode()).digest(length=16)
+                hit = self._pred_cache.get(key)
+                if hit is not None:
+                    r["sentiment"], r["confidence"] = hit
+                else:
+                    misses.append((key, r))
+
+        if misses:
+            # Length-bucketed batching: process in order of (approximate)
+            # token length so each chunk only pads to its own max length,
+            # not to the longest review of the whole scrape.
+            order = sorted(
+                range(len(misses)),
+                key=lambda i: len(misses[i][1]["review_text"].split())
+            )
+
+            for start in range(0, len(order), 32):
+                chunk = order[start:start + 32]
+                texts = [misses[i][1]["review_text"] for i in chunk]
+                try:
+                    # inference_mode: no autograd bookkeeping (no-op on ONNX)
+                    with torch.inference_mode():
+                        predictions = self.analyzer.predict(texts)
+                except Exception as e:
+                    print(f"⚠️ NLP Error on batch of {len(texts)} texts: {e}")
+                    predictions = None
+
+                if predictions is not None:
+                    for i, prediction in zip(chunk, predictions):
+                        key, r = misses[i]
+                        sentiment = prediction.output # POS, NEG, NEU
+                        score = max(prediction.probas.values())
+
+                        r["sentiment"] = sentiment
+                        r["confidence"] = round(score, 4)
+                        with self._cache_lock:
+                            self._pred_cache[key] = (sentiment, r["confidence"])
+                else:
+                    for i in chunk:
+                        _, r = misses[i]
+                        r["sentiment"] = "ERROR"
+                        r["confidence"] = 0.0
+
+        # Metadata aggregation in one pass, outside the predict loop
+        ratings = [float(r["rating"]) for r in reviews if r.get("rating")]
+        avg_rating = round(statistics.fmean(ratings), 2) if ratings else 0
+
+        counts = Counter(r["sentiment"] for r in results)
+        summary = {label: counts.get(label, 0) for label in ("POS", "NEG", "NEU")}
+
         return {
             "reviews": results,
             "sentiment_summary": summary,
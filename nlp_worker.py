@@ -0,0 +1,61 @@
+"""
+Dedicated NLP inference process shared across uvicorn workers.
+
+With --workers N each API process would load its own ~500MB robertuito
+copy. Instead, a single side-process hosts one ReviewAnalyzer and the
+API workers proxy analyze() calls to it over a local socket. Enable by
+setting NLP_SHARED=1 (start.sh launches this module automatically).
+"""
+import os
+import time
+from multiprocessing.managers import BaseManager
+
+NLP_ADDRESS = ("127.0.0.1", int(os.environ.get("NLP_PORT", "8765")))
+NLP_AUTHKEY = os.environ.get("NLP_AUTHKEY", "modelscrappy-nlp").encode()
+
+
+class NLPManager(BaseManager):
+    pass
+
+
+def serve():
+    """Runs the NLP worker process (blocks). Started via `python nlp_worker.py`."""
+    from nlp import ReviewAnalyzer
+
+    analyzer = ReviewAnalyzer()
+    NLPManager.register("get_analyzer", callable=lambda: analyzer)
+    manager = NLPManager(address=NLP_ADDRESS, authkey=NLP_AUTHKEY)
+    server = manager.get_server()
+    print(f"🧠 NLP worker listening on {NLP_ADDRESS[0]}:{NLP_ADDRESS[1]}")
+    server.serve_forever()
+
+
+def connect(timeout=None):
+    """
+    Returns a proxy to the shared ReviewAnalyzer (same analyze() interface).
+
+    El socket del worker solo abre cuando ReviewAnalyzer terminó de cargar
+    (decenas de segundos, o más si hay export ONNX), así que reintenta con
+    backoff hasta NLP_CONNECT_TIMEOUT segundos (default 180) en vez de
+    rendirse al primer ConnectionRefusedError.
+    """
+    if timeout is None:
+        timeout = float(os.environ.get("NLP_CONNECT_TIMEOUT", "180"))
+
+    NLPManager.register("get_analyzer")
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while True:
+        manager = NLPManager(address=NLP_ADDRESS, authkey=NLP_AUTHKEY)
+        try:
+            manager.connect()
+            return manager.get_analyzer()
+        except (ConnectionError, OSError):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(delay)
+            delay = min(delay * 2, 10)
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+
+class AnalysisRequest(BaseModel):
+    maps_url: str
+    forceUpdate: bool = False
+    limit: int = 50
+
+class ReviewItem(BaseModel):
+    # extra="allow" keeps scraper metadata (source, scraping_date, ...)
+    model_config = {"extra": "allow"}
+
+    username: str = "Unknown"
+    rating: float = 0
+    review_text: str = ""
+    sentiment: str = "NEU"
+    confidence: float = 0.0
+
+class ReviewAnalysisResponse(BaseModel):
+    business_name: str | None = None
+    total_reviews: int
+    sentiment_summary: dict[str, int]
+    average_rating: float
+    reviews: list[ReviewItem]
+    cached: bool = False
+    # Solo presentes en respuestas de fallback (exclude_none)
+    fallback: bool | None = None
+    fallback_random: bool | None = None
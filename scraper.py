@@ -1,68 +1,399 @@
-import csv
+import asyncio
+import logging
 import time
 import argparse
 import random
 import os
 import json
+import struct
 from datetime import datetime
-from playwright.sync_api import sync_playwright, TimeoutError
+from hashlib import blake2b
 import re
 
+# csv y playwright se importan de forma perezosa dentro de los métodos que
+# los usan: `import scraper` (p.ej. desde la API) arranca sin pagar el
+# cold-start de playwright (~200ms) hasta el primer scrape real.
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+logger = logging.getLogger("scraper")
+
+# Compiled once; these run per review element / per login attempt
+_RATING_RE = re.compile(r'(\d+[.,]?\d*)')
+_REVIEWS_TAB_RE = re.compile(r"Rese[ñn]as|Reviews")
+_LOGIN_URL_RE = re.compile(r"myaccount\.google\.com|accounts\.google\.com/ManageAccount")
+_IGNORED_LINES = frozenset({
+    "Me gusta", "Compartir", "Más", "Like", "Share", "More",
+    "Responder", "Response", "Estrella", "star",
+})
+
+# Batch extraction: locator.evaluate_all runs this once with every matched
+# element, so ONE IPC returns all visible reviews as plain dicts instead of
+# 4-6 locator round-trips per element.
+_EXTRACT_REVIEWS_JS = """
+(els) => els.map(el => {
+    const star = el.querySelector('[aria-label*="star"],[aria-label*="estrella"],[aria-label*="Estrella"]');
+    const content = el.querySelector('.wiI7pd');
+    return {
+        aria: el.getAttribute('aria-label') || '',
+        ratingAria: star ? (star.getAttribute('aria-label') || '') : '',
+        text: content ? content.innerText : '',
+        raw: el.innerText
+    };
+})
+"""
+
+def _flatten_ugc(node, strings, numbers):
+    if isinstance(node, str):
+        strings.append(node)
+    elif isinstance(node, bool):
+        pass
+    elif isinstance(node, int):
+        numbers.append(node)
+    elif isinstance(node, list):
+        for child in node:
+            _flatten_ugc(child, strings, numbers)
+
+
+def _parse_ugc_posts(body):
+    """
+    Best-effort parser del payload interno `listugcposts` de Maps (el XHR
+    que alimenta el panel de reseñas). El formato es un array anidado sin
+    documentar, así que en vez de índices fijos se localiza cada bloque de
+    reseña por la URL de perfil del autor (/maps/contrib/) y se extraen
+    autor, rating y texto con heurísticas. Devuelve [] si el layout no
+    encaja; el caller siempre conserva la extracción por DOM como fallback.
+    """
+    if body.startswith(")]}'"):
+        body = body[4:]
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return []
+
+    # Un "bloque de reseña" es la lista más alta del árbol que contiene
+    # exactamente UNA URL de contribuidor.
+    roots = []
+
+    def count_contrib(node):
+        if isinstance(node, str):
+            return 1 if "/maps/contrib/" in node else 0
+        if not isinstance(node, list):
+            return 0
+        child_counts = [count_contrib(child) for child in node]
+        total = sum(child_counts)
+        if total > 1:
+            for child, c in zip(node, child_counts):
+                if c == 1 and isinstance(child, list):
+                    roots.append(child)
+        return total
+
+    if count_contrib(data) == 1:
+        roots.append(data)
+
+    reviews = []
+    for root in roots:
+        strings, numbers = [], []
+        _flatten_ugc(root, strings, numbers)
+
+        contrib_idx = next(
+            (i for i, s in enumerate(strings) if "/maps/contrib/" in s), 0
+        )
+        # El nombre del autor va pegado a su URL de perfil
+        username = "Unknown"
+        for s in strings[max(0, contrib_idx - 2):contrib_idx + 3]:
+            if s and not s.startswith("http"):
+                username = s
+                break
+
+        candidates = [
+            s for s in strings
+            if len(s) > 2 and not s.startswith("http") and s != username
+        ]
+        review_text = max(candidates, key=len, default="")
+        rating = next((n for n in numbers if 1 <= n <= 5), 0)
+
+        reviews.append({
+            "username": username,
+            "rating": rating,
+            "review_text": review_text,
+        })
+    return reviews
+
+
+# Expande todas las reseñas truncadas en un solo round-trip; devuelve
+# cuántos botones se pulsaron para saber si hay que esperar al re-render.
+_EXPAND_REVIEWS_JS = """
+() => {
+    const buttons = document.querySelectorAll(
+        "button[aria-label^='Ver más'], button[aria-label^='See more']"
+    );
+    buttons.forEach(b => b.click());
+    return buttons.length;
+}
+"""
+
+_SCROLL_LAST_REVIEW_JS = """
+(cls) => {
+    const els = document.getElementsByClassName(cls);
+    if (els.length) els[els.length - 1].scrollIntoView();
+}
+"""
+
+# RESTORING STEALTH ARGUMENTS (CRITICAL FOR LOGIN)
+_BROWSER_ARGS = [
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-setuid-sandbox",
+]
+
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Script de stealth ÚNICO para todos los contextos (pool, run_many, setup
+# manual): minificado porque se inyecta y parsea en cada documento nuevo.
+_STEALTH_JS = (
+    "Object.defineProperty(navigator,'webdriver',{get:()=>undefined});"
+    "Object.defineProperty(navigator,'languages',{get:()=>['es-ES','es','en']});"
+    "Object.defineProperty(navigator,'plugins',{get:()=>[1,2,3,4,5]});"
+    "window.chrome=window.chrome||{runtime:{}};"
+)
+
+# Request blocking: las reseñas son texto; imágenes, fuentes, vídeos, CSS
+# y trackers solo queman ancho de banda y CPU del renderer. Se desactiva
+# con SCRAPER_DEBUG=1 porque los screenshots necesitan la página pintada.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+_BLOCKED_URL_PARTS = (
+    "googletagmanager.com",
+    "doubleclick.net",
+    "google-analytics.com",
+    "gstatic.com/maps/api",
+)
+
+
+def _should_block(request):
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        return True
+    url = request.url
+    return any(part in url for part in _BLOCKED_URL_PARTS)
+
+
+def _install_request_blocking(context):
+    if os.environ.get("SCRAPER_DEBUG") == "1":
+        return
+    context.route(
+        "**/*",
+        lambda route: route.abort() if _should_block(route.request) else route.continue_(),
+    )
+
+
+async def _install_request_blocking_async(context):
+    if os.environ.get("SCRAPER_DEBUG") == "1":
+        return
+
+    async def _route(route):
+        if _should_block(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", _route)
+
+
+class BrowserPool:
+    """
+    Launches Chromium ONCE and hands out a fresh BrowserContext per scrape.
+    Avoids paying the browser cold-start on every scrape() call; only
+    contexts are created/closed per job.
+    """
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+
+    def start(self):
+        if self._browser is None:
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(
+                headless=self.headless,
+                args=_BROWSER_ARGS
+            )
+        return self
+
+    def acquire_context(self):
+        """Returns a new stealth context on the shared browser."""
+        self.start()
+        context = self._browser.new_context(
+            user_agent=_USER_AGENT,
+            viewport={"width": 1920, "height": 1080},
+            locale="es-ES",
+            device_scale_factor=1,
+        )
+
+        # Mask Webdriver property
+        context.add_init_script(_STEALTH_JS)
+        return context
+
+    def release(self, context):
+        try:
+            context.close()
+        except Exception:
+            pass
+
+    def close(self):
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 class GoogleMapsScraper:
     """
     Advanced Scraper for Google Maps Reviews with Google Login support.
     Designed for Headless Cloud environments (Render).
     """
 
-    def __init__(self, url, max_reviews=100, headless=True):
+    CSV_FIELDS = ["business_name", "username", "rating", "review_text", "source", "scraping_date"]
+
+    def __init__(self, url, max_reviews=100, headless=True, pool=None):
         self.url = url
         self.max_reviews = max_reviews
         self.headless = headless
+        self.pool = pool  # optional shared BrowserPool
         self.reviews_data = []
         self.REVIEW_CONTAINER_CLASS = "jJc9Ad"
         self.email = os.environ.get("GOOGLE_EMAIL")
         self.password = os.environ.get("GOOGLE_PASSWORD")
+        # Streaming CSV state (populated when scrape() runs without return_data)
+        self._csv_path = None
+        self._csv_fp = None
+        self._writer = None
+        self._seen_fp = None
+        self._csv_resumed = False
+        self._count = 0
+        # Hash del último jar de cookies persistido (evita reescrituras)
+        self._cookie_digest = None
+        # True por defecto: contextos sin tracking instalado siempre guardan
+        self._cookie_dirty = True
+        # Screenshots y dumps de depuración solo con SCRAPER_DEBUG=1
+        self.debug = os.environ.get("SCRAPER_DEBUG") == "1"
+
+    @staticmethod
+    def _fingerprint(text):
+        """Stable 64-bit review fingerprint (hash() is salted per process).
+        Se guarda como int: hashea a sí mismo y pesa menos que bytes en el
+        set de dedup, que se consulta por cada elemento visible en cada
+        vuelta de scroll."""
+        digest = blake2b(text.encode('utf-8', 'ignore'), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def _seen_path(self):
+        """seen file scoped per URL, junto al CSV del mismo hash."""
+        import hashlib
+        return f"seen_{hashlib.md5(self.url.encode()).hexdigest()[:8]}.bin"
+
+    def _load_seen(self, path):
+        """Fingerprints from previous runs, so CSV scrapes can resume."""
+        seen = set()
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    seen = {v for (v,) in struct.iter_unpack("<Q", f.read())}
+                self.log(f"🔁 {len(seen)} reseñas ya vistas en {path}.")
+            except Exception as e:
+                self.log(f"⚠️ Error cargando {path}: {e}")
+        return seen
+
+    def _close_seen(self):
+        if self._seen_fp is not None:
+            self._seen_fp.close()
+            self._seen_fp = None
+
+    def _open_csv(self, filename=None):
+        import csv
+        if not filename:
+            import hashlib
+            url_hash = hashlib.md5(self.url.encode()).hexdigest()[:8]
+            filename = f"reviews_{url_hash}.csv"
+        self._csv_path = filename
+        # Reanudación: solo si existen el CSV Y su seen file se añade al
+        # final; en cualquier otro caso se empieza de cero. Un resume no
+        # puede truncar jamás el fichero que está reanudando.
+        self._csv_resumed = os.path.exists(filename) and os.path.exists(self._seen_path())
+        mode = 'a' if self._csv_resumed else 'w'
+        # Large buffer: rows hit the page cache in big chunks, not per write
+        self._csv_fp = open(filename, mode, encoding='utf-8', newline='', buffering=1 << 20)
+        self._writer = csv.DictWriter(self._csv_fp, fieldnames=self.CSV_FIELDS)
+        if not self._csv_resumed:
+            self._writer.writeheader()
+
+    def _close_csv(self):
+        if self._csv_fp is not None:
+            self._csv_fp.close()
+            self._csv_fp = None
+            self._writer = None
+
+    def _emit(self, record):
+        """Streams the record to CSV, or buffers it when the caller wants data back."""
+        if self._writer is not None:
+            self._writer.writerow(record)
+        else:
+            self.reviews_data.append(record)
+        self._count += 1
         
     def log(self, message):
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}")
+        # logging's formatter stamps the time; no per-call strftime here
+        logger.info(message)
 
     def random_sleep(self, min_s=1.0, max_s=3.0):
         time.sleep(random.uniform(min_s, max_s))
 
     def login_google(self, page):
         """Attempts to log in to Google with strict validation and debugging."""
+        from playwright.sync_api import TimeoutError
         if not self.email or not self.password:
             self.log("⚠️ Credentials not found. Aborting login (Anonymous mode).")
             return False
 
         self.log("🔐 Starting Google Login (Strict Debug Mode)...")
-        debug_dir = "debug"
-        if not os.path.exists(debug_dir):
-            os.makedirs(debug_dir)
+        if self.debug and not os.path.exists("debug"):
+            os.makedirs("debug")
 
         try:
             # STEP 1: Navigate to Login (Force ServiceLogin)
             login_url = "https://accounts.google.com/ServiceLogin?hl=es"
             self.log(f"STEP 1: Navigating to {login_url}...")
-            page.goto(login_url, timeout=60000)
-            page.wait_for_load_state("domcontentloaded")
-            
+            page.goto(login_url, wait_until="domcontentloaded", timeout=30000)
+
             # Check for immediate redirects or wrong page
             current_url = page.url
             self.log(f"Current URL after load: {current_url}")
             
             if "accounts.google.com" not in current_url:
                 self.log(f"❌ CRITICAL ERROR: Redirected away from login page to: {current_url}")
-                page.screenshot(path=f"{debug_dir}/login_error_redirected.png")
+                self._shot(page, "login_error_redirected")
                 return False
                 
-            page.screenshot(path=f"{debug_dir}/login_step1_loaded.png")
+            self._shot(page, "login_step1_loaded")
 
-            # Check for "Browser not secure" error immediately
-            if page.locator("text=This browser or app may not be secure").is_visible() or \
-               page.locator("text=Este navegador o aplicación no es seguro").is_visible():
+            # Check for "Browser not secure" error immediately.
+            # or_() resolves both texts in ONE driver round-trip instead of
+            # two serial is_visible() probes.
+            blocked = page.locator("text=This browser or app may not be secure").or_(
+                page.locator("text=Este navegador o aplicación no es seguro")
+            )
+            if blocked.first.is_visible():
                 self.log("❌ CRITICAL: Google blocked this browser instance (Anti-bot detection).")
-                page.screenshot(path=f"{debug_dir}/login_error_blocked.png")
+                self._shot(page, "login_error_blocked")
                 return False
 
             # STEP 2: Email Input
@@ -72,15 +403,16 @@ class GoogleMapsScraper:
             # Additional check: Is it really the login form?
             if not email_input.is_visible(timeout=10000):
                 self.log("❌ ERROR: Email input not found. Dumping HTML...")
-                page.screenshot(path=f"{debug_dir}/login_error_no_email.png")
-                with open(f"{debug_dir}/login_page_dump.html", "w") as f:
-                    f.write(page.content())
+                self._shot(page, "login_error_no_email")
+                if self.debug:
+                    with open("debug/login_page_dump.html", "w") as f:
+                        f.write(page.content())
                 return False
             
             self.log(f"Entering email: {self.email[:3]}***@...")
             email_input.fill(self.email)
             self.random_sleep(1, 2)
-            page.screenshot(path=f"{debug_dir}/login_step2_email_filled.png")
+            self._shot(page, "login_step2_email_filled")
 
             # STEP 3: Click Next
             self.log("STEP 3: Clicking 'Next'...")
@@ -90,10 +422,11 @@ class GoogleMapsScraper:
                 return False
             
             next_btn.click()
+            # No networkidle here: Google keeps background XHRs alive and the
+            # wait would stall until timeout; STEP 4's selector wait is the
+            # real transition signal.
             self.log("Clicked Next. Waiting for transition...")
-            page.wait_for_load_state("networkidle")
-            self.random_sleep(2, 4)
-            page.screenshot(path=f"{debug_dir}/login_step3_after_next.png")
+            self._shot(page, "login_step3_after_next")
 
             # Check for immediate errors after email (e.g. "Couldn't find your Google Account")
             if page.locator("text=Couldn't find your Google Account").is_visible():
@@ -107,14 +440,14 @@ class GoogleMapsScraper:
             except TimeoutError:
                 self.log("❌ ERROR: Password field did not appear.")
                 self.log(f"Stuck at URL: {page.url}")
-                page.screenshot(path=f"{debug_dir}/login_error_no_password.png")
+                self._shot(page, "login_error_no_password")
                 return False
 
             self.log("Password field detected. Entering password...")
             pwd_input = page.locator('input[type="password"]')
             pwd_input.fill(self.password)
             self.random_sleep(1, 2)
-            page.screenshot(path=f"{debug_dir}/login_step4_password_filled.png")
+            self._shot(page, "login_step4_password_filled")
 
             # STEP 5: Click Password Next
             self.log("STEP 5: Clicking Password Next...")
@@ -126,13 +459,13 @@ class GoogleMapsScraper:
             try:
                 # Wait for navigation to My Account or similar authenticated page
                 # or wait for the URL to NOT contain 'signin' or 'ServiceLogin'
-                page.wait_for_url(re.compile(r"myaccount\.google\.com|accounts\.google\.com/ManageAccount"), timeout=30000)
+                page.wait_for_url(_LOGIN_URL_RE, timeout=30000)
                 self.log("✅ LOGIN SUCCESSFUL: Redirected to validated account page.")
-                page.screenshot(path=f"{debug_dir}/login_success.png")
+                self._shot(page, "login_success")
                 return True
             except TimeoutError:
                 self.log("⚠️ WARNING: No redirect to MyAccount. Checking if we are stuck or CAPTCHA'd...")
-                page.screenshot(path=f"{debug_dir}/login_uncertain.png")
+                self._shot(page, "login_uncertain")
                 # Sometimes it redirects back to the service (Maps? or empty)
                 # Let's assume if no error message is visible, we might be good?
                 # But safer to fail strict validation if requested.
@@ -143,14 +476,50 @@ class GoogleMapsScraper:
 
         except Exception as e:
             self.log(f"❌ EXCEPTION during login: {e}")
-            page.screenshot(path=f"{debug_dir}/login_exception.png")
+            self._shot(page, "login_exception")
             return False
 
+    def _shot(self, page, name):
+        """Debug screenshot; no-op sin SCRAPER_DEBUG=1. JPEG con calidad 60:
+        un orden de magnitud menos de encode+disco que el PNG por defecto."""
+        if not self.debug:
+            return
+        try:
+            page.screenshot(path=f"debug/{name}.jpg", type="jpeg", quality=60)
+        except Exception:
+            pass
+
+    def _track_cookie_changes(self, context):
+        """Marks the jar dirty only when a response carries Set-Cookie."""
+        self._cookie_dirty = False
+        context.on(
+            "response",
+            lambda r: setattr(self, "_cookie_dirty", True)
+            if r.headers.get("set-cookie") else None,
+        )
+
     def save_cookies(self, context, path="cookies.json"):
-        """Saves current cookies to a file."""
+        """Saves current cookies to a file (atomic, skips unchanged jars)."""
+        # Sin Set-Cookie desde el último save no hay nada que volcar:
+        # context.cookies() es un IPC que serializa el jar completo.
+        if not self._cookie_dirty:
+            return
+        self._cookie_dirty = False
+
         cookies = context.cookies()
-        with open(path, "w") as f:
-            json.dump(cookies, f)
+        payload = json.dumps(cookies, separators=(",", ":")).encode()
+
+        # Si el jar no cambió desde el último save, no reescribimos el fichero
+        digest = blake2b(payload, digest_size=16).digest()
+        if digest == self._cookie_digest:
+            return
+        self._cookie_digest = digest
+
+        # tmp + os.replace: nunca dejamos un cookies.json a medio escribir
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
         self.log(f"✅ Cookies guardadas en {path}. Úsalas en Render.")
 
     def load_cookies(self, context, path="cookies.json"):
@@ -160,6 +529,10 @@ class GoogleMapsScraper:
                 with open(path, "r") as f:
                     cookies = json.load(f)
                 context.add_cookies(cookies)
+                self._cookie_digest = blake2b(
+                    json.dumps(cookies, separators=(",", ":")).encode(),
+                    digest_size=16,
+                ).digest()
                 self.log(f"✅ Cookies cargadas desde {path}. Sesión restaurada.")
                 return True
             except Exception as e:
@@ -170,15 +543,17 @@ class GoogleMapsScraper:
         """
         Runs a non-headless browser for manual login and cookie saving.
         """
+        from playwright.sync_api import sync_playwright
+
         self.log("🔵 MODO CONFIGURACIÓN: Inicia sesión manualmente en la ventana que se abrirá.")
-        
+
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=False) # Must be visible
             context = browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 locale="es-ES"
             )
-            context.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            context.add_init_script(_STEALTH_JS)
             
             page = context.new_page()
             
@@ -205,60 +580,43 @@ class GoogleMapsScraper:
         """Extracts the business name from the page."""
 
         try:
-            return page.locator("h1").inner_text().strip()
+            # Accessibility tree: estable aunque Google rote las clases
+            # ofuscadas (a5H0ec, DUwDvf, ...) y sin resolución CSS completa
+            return page.get_by_role("heading", level=1).first.inner_text().strip()
         except:
             return "Unknown Business"
-        #try:
-            # Selector identified in prompt: class "a5H0ec" or "DUwDvf" (common title classes)
-            # a5H0ec seems to be the main title header class often
-            #title_el = page.locator(".a5H0ec, h1.DUwDvf").first
-        #    if title_el.is_visible():
-        #        return title_el.inner_text()
-        #    return "Unknown Business"
-        #except:
-        #    return "Unknown Business"
 
     def scrape(self, return_data=False):
+        from playwright.sync_api import TimeoutError
+
         self.log(f"Iniciando scraping (Headless: {self.headless})")
-        
-        # Ensure debug directory exists
-        if not os.path.exists("debug"):
+
+        # Ensure debug directory exists (solo en modo debug)
+        if self.debug and not os.path.exists("debug"):
             os.makedirs("debug")
-            
-        # RESTORING STEALTH ARGUMENTS (CRITICAL FOR LOGIN)
-        browser_args = [
-            #"--disable-blink-features=AutomationControlled",
-            #"--no-sandbox",
-            #"--disable-setuid-sandbox",
-            #"--disable-infobars",
-            #"--start-maximized",
-            "--disable-gpu",
-            "--no-sandbox",
-            "--disable-dev-shm-usage",
-            "--disable-setuid-sandbox",
-        ]
 
-        with sync_playwright() as p:
-            # Launch Browser
-            browser = p.chromium.launch(
-                headless=self.headless,
-                args=browser_args
-            )
-            
-            # Create Stealth Context
-            context = browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                viewport={"width": 1920, "height": 1080},
-                locale="es-ES",
-                device_scale_factor=1,
-            )
-            
-            # Mask Webdriver property
-            context.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-            """)
+        self._count = 0
+
+        # Reuse the shared pool if provided; standalone calls (CLI) spin up
+        # a throwaway one so behavior is unchanged.
+        pool = self.pool
+        own_pool = pool is None
+        context = None
+        page = None
+
+        # Toda adquisición de recursos (CSV, pool, contexto, página) vive
+        # dentro del try: un fallo en cualquier punto pasa por el finally,
+        # que libera el contexto y el pool en vez de filtrar el Chromium.
+        try:
+            if not return_data:
+                # CSV-only run: stream rows to disk, keep O(1) memory
+                self._open_csv()
+
+            if own_pool:
+                pool = BrowserPool(headless=self.headless).start()
+
+            context = pool.acquire_context()
+            self._track_cookie_changes(context)
 
             # --- AUTH STRATEGY ---
             # 1. Try Cookie Login first
@@ -266,218 +624,478 @@ class GoogleMapsScraper:
                 self.log("🍪 Usando autenticación por Cookies.")
             else:
                 self.log("⚠️ Ejecutándose como ANÓNIMO (sin cookies).")
-            
+
+            _install_request_blocking(context)
             page = context.new_page()
 
-            # Continue to Maps...
-            try:
-                self.log(f"Navegando a: {self.url}")
-                page.goto(self.url, timeout=60000)
-                #wait for full address
-                page.wait_for_url("**/maps/place/**", timeout=45000)
-                page.wait_for_selector('div[role="main"]', timeout=30000)
-                # Esperar CUALQUIERA de los elementos clave del perfil
+            # --- Captura CDP (opt-in con SCRAPER_CDP=1) ---
+            # El panel de reseñas se alimenta de XHRs a `listugcposts`: con
+            # una sesión CDP leemos ese JSON directamente y el scroll solo
+            # sirve para disparar más páginas. Si el parser no reconoce el
+            # payload (formato sin documentar), la extracción DOM sigue.
+            cdp_batches = []
+            if os.environ.get("SCRAPER_CDP") == "1":
                 try:
-                    page.wait_for_selector(
-                        "h1, button[aria-label*='Reviews'], button[aria-label*='Reseñas']",
-                        timeout=30000
-                    )
-                except TimeoutError:
-                    self.log("⚠️ No se detectó el panel del negocio (vista no cargada).")
-                    raise Exception("Business panel not loaded")
-
-                #self.random_sleep(3, 5)
-
-                # Extract Business Name
-                business_name = self._extract_business_name(page)
-                self.log(f"📍 Business Found: {business_name}")
-
-                # Intentar abrir el panel de reseñas si no está abierto
-                # Buscamos botón que diga "Reseñas" o el conteo de estrellas
-                # self.log("Buscando panel de reseñas...")
-                # try:
-                #     # Selector genérico para el tab de 'Reseñas'
-                #     reviews_tab = page.locator("button[aria-label*='Reseñas'], button[aria-label*='Reviews']").first
-                #     if reviews_tab.is_visible():
-                #          reviews_tab.click()
-                #          self.random_sleep(2, 4)
-                # except:
-                #     pass
-
-                # # Esperar contenedor de reseñas
-                # try:
-                #     page.wait_for_selector(f".{self.REVIEW_CONTAINER_CLASS}", timeout=20000)
-                # except TimeoutError:
-                #     self.log("⚠️ No se encontraron reseñas visiblemente.")
-                #     return [] if return_data else None
-
-                self.log("Buscando panel de reseñas...")
-
-                # 1️⃣ Esperar activamente el botón de reseñas
-                try:
-                    reviews_tab = page.locator(
-                        "button[aria-label*='Reviews'], button[aria-label*='Reseñas']"
-                    )
+                    cdp = context.new_cdp_session(page)
+                    cdp.send("Network.enable")
+                    pending = set()
 
-                    reviews_tab.wait_for(state="visible", timeout=30000)
-                    reviews_tab.first.click()
-                    self.random_sleep(2, 4)
+                    # El cuerpo solo está disponible de forma fiable en
+                    # loadingFinished; en responseReceived los XHR en
+                    # streaming aún no han terminado de bajar.
+                    def _on_response(event):
+                        url = event.get("response", {}).get("url", "")
+                        if "listugcposts" in url or "/reviews?" in url:
+                            pending.add(event["requestId"])
 
+                    def _on_finished(event):
+                        request_id = event.get("requestId")
+                        if request_id not in pending:
+                            return
+                        pending.discard(request_id)
+                        try:
+                            body = cdp.send(
+                                "Network.getResponseBody",
+                                {"requestId": request_id},
+                            )["body"]
+                        except Exception:
+                            return  # el navegador ya descartó el cuerpo
+                        parsed = _parse_ugc_posts(body)
+                        if parsed:
+                            cdp_batches.append(parsed)
+
+                    cdp.on("Network.responseReceived", _on_response)
+                    cdp.on("Network.loadingFinished", _on_finished)
                 except Exception as e:
-                    self.log(f"⚠️ No se pudo abrir el panel de reseñas: {e}")
-                    return [] if return_data else None
+                    logger.info("⚠️ CDP no disponible (%s); extracción por DOM.", e)
 
+            # Continue to Maps...
+            self.log(f"Navegando a: {self.url}")
+            # domcontentloaded: no esperar tiles/fuentes/trackers del bundle
+            # de Maps; los wait_for_selector de abajo garantizan los datos
+            page.goto(self.url, wait_until="domcontentloaded", timeout=30000)
+            #wait for full address
+            page.wait_for_url("**/maps/place/**", timeout=45000)
+            page.wait_for_selector('div[role="main"]', timeout=30000)
+            # Esperar CUALQUIERA de los elementos clave del perfil
+            try:
+                page.wait_for_selector(
+                    "h1, button[aria-label*='Reviews'], button[aria-label*='Reseñas']",
+                    timeout=30000
+                )
+            except TimeoutError:
+                self.log("⚠️ No se detectó el panel del negocio (vista no cargada).")
+                raise Exception("Business panel not loaded")
 
-                # 2️⃣ Esperar reseñas usando selector ESTABLE
-                try:
-                    page.wait_for_selector("[data-review-id]", timeout=30000)
-                except TimeoutError:
-                    self.log("⚠️ Panel de reseñas abierto, pero sin reseñas visibles.")
-                    return [] if return_data else None
-                
+            #self.random_sleep(3, 5)
+
+            # Extract Business Name
+            business_name = self._extract_business_name(page)
+            self.log(f"📍 Business Found: {business_name}")
+
+            # Intentar abrir el panel de reseñas si no está abierto
+            # Buscamos botón que diga "Reseñas" o el conteo de estrellas
+            # self.log("Buscando panel de reseñas...")
+            # try:
+            #     # Selector genérico para el tab de 'Reseñas'
+            #     reviews_tab = page.locator("button[aria-label*='Reseñas'], button[aria-label*='Reviews']").first
+            #     if reviews_tab.is_visible():
+            #          reviews_tab.click()
+            #          self.random_sleep(2, 4)
+            # except:
+            #     pass
+
+            # # Esperar contenedor de reseñas
+            # try:
+            #     page.wait_for_selector(f".{self.REVIEW_CONTAINER_CLASS}", timeout=20000)
+            # except TimeoutError:
+            #     self.log("⚠️ No se encontraron reseñas visiblemente.")
+            #     return [] if return_data else None
 
-                # Scroll loop
+            self.log("Buscando panel de reseñas...")
+
+            # 1️⃣ Esperar activamente el tab de reseñas (por rol ARIA, no
+            # por clases ofuscadas)
+            try:
+                reviews_tab = page.get_by_role("tab", name=_REVIEWS_TAB_RE)
+
+                reviews_tab.first.wait_for(state="visible", timeout=30000)
+                reviews_tab.first.click()
+                self.random_sleep(2, 4)
+
+            except Exception as e:
+                self.log(f"⚠️ No se pudo abrir el panel de reseñas: {e}")
+                return [] if return_data else None
+
+
+            # 2️⃣ Esperar reseñas usando selector ESTABLE
+            try:
+                page.wait_for_selector("[data-review-id]", timeout=30000)
+            except TimeoutError:
+                self.log("⚠️ Panel de reseñas abierto, pero sin reseñas visibles.")
+                return [] if return_data else None
+            
+
+            # Scroll loop
+            # CSV runs dedup against the per-URL seen file (resume). Si el
+            # CSV se empezó de cero, el seen antiguo se trunca con él para
+            # no suprimir reseñas que ya no están en el fichero.
+            if self._writer is not None:
+                seen_path = self._seen_path()
+                if self._csv_resumed:
+                    processed_ids = self._load_seen(seen_path)
+                    self._seen_fp = open(seen_path, "ab")
+                else:
+                    processed_ids = set()
+                    self._seen_fp = open(seen_path, "wb")
+            else:
                 processed_ids = set()
-                last_count = 0
-                retries = 0
-                max_retries = 5
-                
-                # Elemento contenedor para scroll es usualmente el padre directo de los items
-                # o usamos el mouse wheel global si el mouse está sobre el panel
-                
-                while len(self.reviews_data) < self.max_reviews:
-                    # Parse current visible reviews
-                    elements = page.locator(f".{self.REVIEW_CONTAINER_CLASS}").all()
-                    self.log(f"Found {len(elements)} visible review elements.")
-                    
-                    for i, el in enumerate(elements):
-                        if len(self.reviews_data) >= self.max_reviews:
-                            break
-                        
-                        try:
-                            # Unique ID based on text
-                            text_content = el.inner_text()
-                            content_hash = hash(text_content)
-                            
-                            if content_hash in processed_ids:
-                                continue
-                                
-                            processed_ids.add(content_hash)
-                            
-                            # Parse fields
-                            username = self._extract_username(el)
-                            rating = self._extract_rating(el)
-                            review_text = self._extract_text(el)
-                            
-                            record = {
-                                "business_name": business_name,
-                                "username": username,
-                                "rating": rating,
-                                "review_text": review_text,
-                                "source": "Google Maps",
-                                "scraping_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            }
-                            self.reviews_data.append(record)
-                        except Exception as e:
-                            self.log(f"Error processing review item: {e}")
+            last_count = 0
+            retries = 0
+            max_retries = 5
+            iteration = 0
+
+            # Elemento contenedor para scroll es usualmente el padre directo de los items
+            # o usamos el mouse wheel global si el mouse está sobre el panel
+
+            while self._count < self.max_reviews:
+                # Reseñas capturadas por CDP: JSON estructurado, sin IPC por
+                # elemento. En las vueltas en que el parser produce datos el
+                # DOM solo se usa para hacer scroll; si deja de reconocer el
+                # payload, la vuelta siguiente vuelve a parsear el DOM.
+                cdp_parsed = []
+                while cdp_batches:
+                    cdp_parsed.extend(cdp_batches.pop(0))
+
+                for parsed in cdp_parsed:
+                    if self._count >= self.max_reviews:
+                        break
+                    content_hash = self._fingerprint(
+                        f"{parsed['username']}|{parsed['review_text']}"
+                    )
+                    if content_hash in processed_ids:
+                        continue
+                    processed_ids.add(content_hash)
+                    if self._seen_fp is not None:
+                        self._seen_fp.write(struct.pack("<Q", content_hash))
+                    self._emit({
+                        "business_name": business_name,
+                        "username": parsed["username"],
+                        "rating": parsed["rating"],
+                        "review_text": parsed["review_text"],
+                        "source": "Google Maps",
+                        "scraping_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    })
+
+                # Expand truncated reviews first (one batched evaluate)
+                self._expand_reviews(page)
+
+                # Pull every visible review in ONE evaluate round-trip
+                batch = page.locator(
+                    f".{self.REVIEW_CONTAINER_CLASS}"
+                ).evaluate_all(_EXTRACT_REVIEWS_JS)
+                # Logs de progreso solo cada 10 iteraciones: en scrapes largos
+                # el I/O de consola por vuelta de scroll no es gratis.
+                iteration += 1
+                if iteration % 10 == 1:
+                    logger.info("Found %d visible review elements.", len(batch))
+
+                # Solo en vueltas donde CDP entregó datos se salta el DOM
+                for item in (() if cdp_parsed else batch):
+                    if self._count >= self.max_reviews:
+                        break
+
+                    try:
+                        # Parse fields (pure Python, no more IPC)
+                        username = self._parse_username(item)
+                        rating = self._parse_rating(item["ratingAria"])
+                        review_text = self._parse_text(item, username)
+
+                        # ID canónico autor|texto: coincide entre CDP y DOM
+                        content_hash = self._fingerprint(f"{username}|{review_text}")
+
+                        if content_hash in processed_ids:
                             continue
-                            
-                    self.log(f"Progreso: {len(self.reviews_data)}/{self.max_reviews}")
-                    
-                    # Scroll logic
-                    if elements:
-                        # Scroll to last element
-                        elements[-1].scroll_into_view_if_needed()
-                        
-                        # Mouse wheel en el centro de la pantalla (a veces el panel está a la izquierda)
-                        # Coordenadas aproximadas del panel lateral
-                        page.mouse.move(400, 600)
-                        page.mouse.wheel(0, 3000)
-                        
-                        # Keyboard End
-                        page.keyboard.press("End")
-                    
+
+                        processed_ids.add(content_hash)
+                        if self._seen_fp is not None:
+                            self._seen_fp.write(struct.pack("<Q", content_hash))
+
+                        record = {
+                            "business_name": business_name,
+                            "username": username,
+                            "rating": rating,
+                            "review_text": review_text,
+                            "source": "Google Maps",
+                            "scraping_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        }
+                        self._emit(record)
+                    except Exception as e:
+                        logger.info("Error processing review item: %s", e)
+                        continue
+
+                if iteration % 10 == 1:
+                    logger.info("Progreso: %d/%d", self._count, self.max_reviews)
+
+                # Scroll logic
+                if batch:
+                    # Scroll to last element
+                    page.evaluate(_SCROLL_LAST_REVIEW_JS, self.REVIEW_CONTAINER_CLASS)
+
+                    # Mouse wheel en el centro de la pantalla (a veces el panel está a la izquierda)
+                    # Coordenadas aproximadas del panel lateral
+                    page.mouse.move(400, 600)
+                    page.mouse.wheel(0, 3000)
+
+                    # Keyboard End
+                    page.keyboard.press("End")
+
+                    # Esperar a que el DOM tenga MÁS reseñas en vez de dormir
+                    # 2-4s fijos: normalmente cargan en <1s, y 4s es el tope.
+                    try:
+                        page.wait_for_function(
+                            "(args) => document.getElementsByClassName(args.cls).length > args.prev",
+                            arg={"cls": self.REVIEW_CONTAINER_CLASS, "prev": len(batch)},
+                            timeout=4000,
+                        )
+                    except TimeoutError:
+                        pass  # sin reseñas nuevas; el contador de abajo decide
+                else:
                     self.random_sleep(2, 4)
-                    
-                    if len(self.reviews_data) == last_count:
-                        retries += 1
-                        self.log(f"Esperando nuevas reseñas... (Intento {retries}/{max_retries})")
-                        if retries >= max_retries:
-                            break
-                    else:
-                        retries = 0
-                        last_count = len(self.reviews_data)
 
-            except Exception as e:
-                self.log(f"❌ Error en scraping: {e}")
-                page.screenshot(path="debug/crash_screenshot.png")
-            finally:
-                browser.close()
-                
+
+                if self._count == last_count:
+                    retries += 1
+                    logger.info("Esperando nuevas reseñas... (Intento %d/%d)", retries, max_retries)
+                    if retries >= max_retries:
+                        break
+                else:
+                    retries = 0
+                    last_count = self._count
+
+            # Persistir cookies refrescadas durante la sesión: con el
+            # tracking de Set-Cookie instalado, esto es un no-op si Google
+            # no rotó nada.
+            self.save_cookies(context, "cookies.json")
+
+        except Exception as e:
+            self.log(f"❌ Error en scraping: {e}")
+            self._shot(page, "crash_screenshot")
+        finally:
+            self._close_seen()
+            self._close_csv()
+            if context is not None:
+                pool.release(context)
+            if own_pool and pool is not None:
+                pool.close()
+
         return self.reviews_data if return_data else None
 
-    def _extract_username(self, element):
+    async def scrape_async(self, context):
+        """
+        Async counterpart of scrape() for concurrent multi-URL runs.
+        Runs on a caller-provided async BrowserContext (see run_many).
+        """
+        from playwright.async_api import TimeoutError as AsyncTimeoutError
+
+        page = await context.new_page()
         try:
-            return element.get_attribute("aria-label") or element.inner_text().split('\n')[0]
-        except:
-            return "Unknown"
+            self.log(f"Navegando a: {self.url}")
+            await page.goto(self.url, wait_until="domcontentloaded", timeout=30000)
+            await page.wait_for_url("**/maps/place/**", timeout=45000)
+            await page.wait_for_selector('div[role="main"]', timeout=30000)
+
+            try:
+                business_name = (
+                    await page.get_by_role("heading", level=1).first.inner_text()
+                ).strip()
+            except Exception:
+                business_name = "Unknown Business"
+            self.log(f"📍 Business Found: {business_name}")
+
+            try:
+                reviews_tab = page.get_by_role("tab", name=_REVIEWS_TAB_RE)
+                await reviews_tab.first.wait_for(state="visible", timeout=30000)
+                await reviews_tab.first.click()
+                await asyncio.sleep(random.uniform(2, 4))
+            except Exception as e:
+                self.log(f"⚠️ No se pudo abrir el panel de reseñas: {e}")
+                return self.reviews_data
+
+            try:
+                await page.wait_for_selector("[data-review-id]", timeout=30000)
+            except AsyncTimeoutError:
+                self.log("⚠️ Panel de reseñas abierto, pero sin reseñas visibles.")
+                return self.reviews_data
+
+            processed_ids = set()
+            last_count = 0
+            retries = 0
+            max_retries = 5
 
-    def _extract_rating(self, element):
+            while len(self.reviews_data) < self.max_reviews:
+                batch = await page.locator(
+                    f".{self.REVIEW_CONTAINER_CLASS}"
+                ).evaluate_all(_EXTRACT_REVIEWS_JS)
+
+                for item in batch:
+                    if len(self.reviews_data) >= self.max_reviews:
+                        break
+                    content_hash = self._fingerprint(item["raw"])
+                    if content_hash in processed_ids:
+                        continue
+                    processed_ids.add(content_hash)
+
+                    username = self._parse_username(item)
+                    self.reviews_data.append({
+                        "business_name": business_name,
+                        "username": username,
+                        "rating": self._parse_rating(item["ratingAria"]),
+                        "review_text": self._parse_text(item, username),
+                        "source": "Google Maps",
+                        "scraping_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    })
+
+                if batch:
+                    await page.evaluate(_SCROLL_LAST_REVIEW_JS, self.REVIEW_CONTAINER_CLASS)
+                    await page.mouse.move(400, 600)
+                    await page.mouse.wheel(0, 3000)
+                    await page.keyboard.press("End")
+                    try:
+                        await page.wait_for_function(
+                            "(args) => document.getElementsByClassName(args.cls).length > args.prev",
+                            arg={"cls": self.REVIEW_CONTAINER_CLASS, "prev": len(batch)},
+                            timeout=4000,
+                        )
+                    except AsyncTimeoutError:
+                        pass
+                else:
+                    await asyncio.sleep(random.uniform(2, 4))
+
+                if len(self.reviews_data) == last_count:
+                    retries += 1
+                    if retries >= max_retries:
+                        break
+                else:
+                    retries = 0
+                    last_count = len(self.reviews_data)
+
+        except Exception as e:
+            self.log(f"❌ Error en scraping async: {e}")
+        finally:
+            await page.close()
+
+        return self.reviews_data
+
+    def _expand_reviews(self, page):
+        """Clicks every visible 'Ver más' button so full texts are extracted."""
+        try:
+            # UN solo evaluate hace click() nativo en todos los botones a la
+            # vez, en vez de un round-trip de Playwright por botón.
+            clicked = page.evaluate(_EXPAND_REVIEWS_JS)
+            if clicked:
+                page.wait_for_timeout(300)  # breve margen para que el texto se despliegue
+        except Exception as e:
+            self.log(f"Error expanding reviews: {e}")
+
+    def _parse_username(self, item):
+        return item["aria"] or item["raw"].split('\n')[0] or "Unknown"
+
+    def _parse_rating(self, aria):
         try:
-            star_el = element.locator('[aria-label*="estrella"], [aria-label*="star"], [aria-label*="Estrella"]').first
-            if star_el and star_el.is_visible():
-                aria = star_el.get_attribute("aria-label")
-                match = re.search(r'(\d+(\.|,)?\d*)', aria)
-                if match:
-                    val = match.group(1).replace(',', '.')
-                    return float(val)
+            match = _RATING_RE.search(aria)
+            if match:
+                val = match.group(1).replace(',', '.')
+                return float(val)
             return 0
         except:
             return 0
 
-    def _extract_text(self, element):
-        try:
-            more_btn = element.locator("button[aria-label^='Ver más'], button[aria-label^='See more'], button:has-text('Más')").first
-            if more_btn.is_visible():
-                try: more_btn.click(timeout=1000)
-                except: pass
-            
-            content_span = element.locator(".wiI7pd").first
-            if content_span.is_visible():
-                return content_span.inner_text()
-            
-            full_text = element.inner_text()
-            lines = [l.strip() for l in full_text.split('\n') if l.strip()]
-            ignored = ["Me gusta", "Compartir", "Más", "Like", "Share", "More", "Responder", "Response", "Estrella", "star"]
-            candidates = [l for l in lines if l not in ignored and len(l) > 2]
-            
-            if candidates:
-                name = self._extract_username(element)
-                if candidates[0] == name: candidates.pop(0)
-                return " ".join(candidates).strip()
+    def _parse_text(self, item, username=None):
+        if item["text"]:
+            return item["text"]
 
-            return ""
-        except:
-            return ""
+        lines = [l.strip() for l in item["raw"].split('\n') if l.strip()]
+        candidates = [l for l in lines if l not in _IGNORED_LINES and len(l) > 2]
+
+        if candidates:
+            # Reuse the already-parsed username instead of re-deriving it
+            name = username if username is not None else self._parse_username(item)
+            if candidates[0] == name: candidates.pop(0)
+            return " ".join(candidates).strip()
+
+        return ""
 
     def save_to_csv(self, filename=None):
+        # Streaming runs already wrote the file during scrape()
+        if self._csv_path is not None:
+            if self._count:
+                self.log(f"✅ Archivo guardado: {self._csv_path}")
+            else:
+                self.log("⚠️ No se extrajeron reseñas.")
+            return
+
         if not self.reviews_data:
             self.log("⚠️ No se extrajeron reseñas.")
             return
-            
+
+        import csv
+
         # Auto-name based on URL hash if no filename
         if not filename:
             import hashlib
             url_hash = hashlib.md5(self.url.encode()).hexdigest()[:8]
             filename = f"reviews_{url_hash}.csv"
-            
+
         with open(filename, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ["business_name", "username", "rating", "review_text", "source", "scraping_date"]
-            w = csv.DictWriter(f, fieldnames=fieldnames)
+            w = csv.DictWriter(f, fieldnames=self.CSV_FIELDS)
             w.writeheader()
             w.writerows(self.reviews_data)
         self.log(f"✅ Archivo guardado: {filename}")
 
+async def run_many(urls, limit=50, n=8):
+    """
+    Scrapes several URLs concurrently: ONE browser, up to n contexts.
+    Page-load waits dominate wall time, so concurrent contexts overlap
+    those stalls. Returns one review list per URL, in order.
+    """
+    from playwright.async_api import async_playwright
+
+    cookies = []
+    if os.path.exists("cookies.json"):
+        try:
+            with open("cookies.json", "r") as f:
+                cookies = json.load(f)
+        except Exception:
+            pass
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=_BROWSER_ARGS)
+        sem = asyncio.Semaphore(n)
+
+        async def one(url):
+            async with sem:
+                context = await browser.new_context(
+                    user_agent=_USER_AGENT,
+                    viewport={"width": 1920, "height": 1080},
+                    locale="es-ES",
+                    device_scale_factor=1,
+                )
+                await context.add_init_script(_STEALTH_JS)
+                if cookies:
+                    await context.add_cookies(cookies)
+                await _install_request_blocking_async(context)
+                try:
+                    return await GoogleMapsScraper(url, max_reviews=limit).scrape_async(context)
+                finally:
+                    await context.close()
+
+        try:
+            return await asyncio.gather(*[one(u) for u in urls])
+        finally:
+            await browser.close()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--url", default="https://maps.app.goo.gl/Ti7ixa3owkmGMdTo9")
@@ -493,6 +1111,7 @@ if __name__ == "__main__":
         # Render environment usually sets RENDER=true
         is_render = os.environ.get("RENDER") is not None
         
-        scraper = GoogleMapsScraper(args.url, max_reviews=args.limit, headless=True)
-        scraper.scrape()
-        scraper.save_to_csv()
+        with BrowserPool(headless=True) as pool:
+            scraper = GoogleMapsScraper(args.url, max_reviews=args.limit, headless=True, pool=pool)
+            scraper.scrape()
+            scraper.save_to_csv()
@@ -1,4 +1,10 @@
 #!/usr/bin/env bash
 # Make sure to use the PORT environment variable provided by Render
 # Logs are enabled for debugging
-uvicorn api:app --host 0.0.0.0 --port $PORT --log-level info
+# Workers scale per-pod concurrency; each one loads its own NLP model copy
+# unless NLP_SHARED=1 routes them all to one nlp_worker.py side-process.
+# Tune UVICORN_WORKERS to the dyno's RAM (default 4).
+if [ "${NLP_SHARED:-0}" = "1" ]; then
+  python nlp_worker.py &
+fi
+uvicorn api:app --host 0.0.0.0 --port ${PORT:-8000} --workers ${UVICORN_WORKERS:-4} --loop uvloop --http httptools --log-level info